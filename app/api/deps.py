@@ -1,65 +1,95 @@
 
-from typing import Generator, Optional
-from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
-from pydantic import ValidationError
-from sqlalchemy.orm import Session
-from datetime import datetime
-
-from app.db.base import SessionLocal
+from collections import OrderedDict
+from typing import AsyncGenerator, Optional, Tuple
+from fastapi import Depends, HTTPException, Request, status
+import jwt
+from sqlalchemy.ext.asyncio import AsyncSession
+import time
+
+from app.db.base import AsyncSessionLocal
 from app.core.config import settings
 from app.core.security import oauth2_scheme
-from app.models.permission import RoleType
+from app.crud.permission import permission_crud
+from app.crud.user import user_crud
+from app.models.event import Event
+from app.models.permission import ROLE_RANK, RoleType
 from app.models.user import User
-from app.schemas.user import TokenPayload
 
 
-def get_db() -> Generator:
+# Decoded access tokens, token -> (user_id, exp). Bounded LRU; expiry is
+# re-checked on every hit so a cached token never outlives its exp claim.
+TOKEN_CACHE_SIZE = 10000
+_token_cache: "OrderedDict[str, Tuple[int, int]]" = OrderedDict()
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency for database session
     """
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> User:
-    """
-    Get the current user from the token
-    """
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        token_data = TokenPayload(**payload)
-        if token_data.type != "access":
-            raise credentials_exception
-        if datetime.fromtimestamp(token_data.exp) < datetime.now():
-            raise credentials_exception
-        user_id: str = token_data.sub
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
+
+
+def _decode_access_token(token: str) -> int:
+    """
+    Validate an access token and return the user id it was issued for
+    """
+    cached = _token_cache.get(token)
+    if cached is None:
+        try:
+            payload = jwt.decode(
+                token,
+                settings.SECRET_KEY,
+                algorithms=[settings.ALGORITHM],
+                options={"require": ["exp", "sub", "type"]},
+            )
+            if payload["type"] != "access":
+                raise _credentials_exception()
+            user_id = int(payload["sub"])
+        except (jwt.PyJWTError, ValueError):
+            raise _credentials_exception()
+        cached = (user_id, payload["exp"])
+        _token_cache[token] = cached
+        if len(_token_cache) > TOKEN_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+    else:
+        _token_cache.move_to_end(token)
+
+    user_id, exp = cached
+    if exp < int(time.time()):
+        _token_cache.pop(token, None)
+        raise _credentials_exception()
+    return user_id
+
+
+async def get_current_user(
+    request: Request, db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme)
+) -> User:
+    """
+    Get the current user from the token
+    """
+    user = getattr(request.state, "user", None)
+    if user is not None:
+        return user
+
+    user_id = _decode_access_token(token)
     
-    from app.crud.user import user_crud
-    user = user_crud.get(db, id=user_id)
+    user = await user_crud.get(db, id=user_id)
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
+    request.state.user = user
     return user
 
 
-def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
     """
     Get the current active user
     """
@@ -71,24 +101,60 @@ def get_current_active_user(current_user: User = Depends(get_current_user)) -> U
     return current_user
 
 
-def get_current_user_with_permission(
-    role: RoleType, event_id: int, current_user: User = Depends(get_current_active_user), db: Session = Depends(get_db)
-) -> User:
+async def get_event_access(
+    event_id: int, request: Request, db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme)
+) -> Tuple[User, Optional[RoleType], Optional[Event]]:
     """
-    Dependency for checking user has appropriate permission for an event
+    Get the current active user with their role on an event and, when they
+    have one, the event itself
     """
-    user_id = current_user.id
+    event_access = getattr(request.state, "event_access", None)
+    if event_access is None:
+        event_access = request.state.event_access = {}
+        
+    user = getattr(request.state, "user", None)
+    if user is not None and event_id in event_access:
+        return (user, *event_access[event_id])
+        
+    user_id = _decode_access_token(token)
     
-    from app.crud.permission import permission_crud
+    row = await user_crud.get_with_event_permission(db, user_id=user_id, event_id=event_id)
+    if row is None:
+        raise _credentials_exception()
+    user, role, event = row
     
-    if role == RoleType.OWNER:
-        has_permission = permission_crud.check_user_is_owner(db, event_id=event_id, user_id=user_id)
-    elif role == RoleType.EDITOR:
-        has_permission = permission_crud.check_user_can_edit(db, event_id=event_id, user_id=user_id)
-    else:  
-        has_permission = permission_crud.check_user_can_view(db, event_id=event_id, user_id=user_id)
+    request.state.user = user
+    event_access[event_id] = (role, event)
+    return await get_current_active_user(user), role, event
+
+
+async def get_user_event_role(
+    request: Request, db: AsyncSession, *, event_id: int, user_id: int
+) -> Optional[RoleType]:
+    """
+    Get any user's role on an event, looking it up at most once per request
+    """
+    user = getattr(request.state, "user", None)
+    event_access = getattr(request.state, "event_access", {})
+    if user is not None and user.id == user_id and event_id in event_access:
+        return event_access[event_id][0]
         
-    if not has_permission:
+    event_roles = getattr(request.state, "event_roles", None)
+    if event_roles is None:
+        event_roles = request.state.event_roles = {}
+    key = (event_id, user_id)
+    if key not in event_roles:
+        event_roles[key] = await permission_crud.get_user_role(db, event_id=event_id, user_id=user_id)
+    return event_roles[key]
+
+
+def get_current_user_with_permission(
+    role: RoleType, current_user: User, actual_role: Optional[RoleType]
+) -> User:
+    """
+    Check the user's role on an event satisfies the required role
+    """
+    if actual_role is None or ROLE_RANK[actual_role] < ROLE_RANK[role]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=f"User doesn't have {role.value} permission for this event"
@@ -97,28 +163,58 @@ def get_current_user_with_permission(
     return current_user
 
 
-def get_event_owner(
-    event_id: int, current_user: User = Depends(get_current_active_user), db: Session = Depends(get_db)
+async def get_event_owner(
+    access: Tuple[User, Optional[RoleType], Optional[Event]] = Depends(get_event_access)
 ) -> User:
     """
     Dependency for checking user is the event owner
     """
-    return get_current_user_with_permission(RoleType.OWNER, event_id, current_user, db)
+    return get_current_user_with_permission(RoleType.OWNER, access[0], access[1])
 
 
-def get_event_editor(
-    event_id: int, current_user: User = Depends(get_current_active_user), db: Session = Depends(get_db)
+async def get_event_editor(
+    access: Tuple[User, Optional[RoleType], Optional[Event]] = Depends(get_event_access)
 ) -> User:
     """
     Dependency for checking user can edit the event
     """
-    return get_current_user_with_permission(RoleType.EDITOR, event_id, current_user, db)
+    return get_current_user_with_permission(RoleType.EDITOR, access[0], access[1])
 
 
-def get_event_viewer(
-    event_id: int, current_user: User = Depends(get_current_active_user), db: Session = Depends(get_db)
+async def get_event_viewer(
+    access: Tuple[User, Optional[RoleType], Optional[Event]] = Depends(get_event_access)
 ) -> User:
     """
     Dependency for checking user can view the event
     """
-    return get_current_user_with_permission(RoleType.VIEWER, event_id, current_user, db)
\ No newline at end of file
+    return get_current_user_with_permission(RoleType.VIEWER, access[0], access[1])
+
+
+async def get_event_owner_and_object(
+    access: Tuple[User, Optional[RoleType], Optional[Event]] = Depends(get_event_access)
+) -> Tuple[Event, User]:
+    """
+    Dependency returning the event and its owner
+    """
+    user, role, event = access
+    return event, get_current_user_with_permission(RoleType.OWNER, user, role)
+
+
+async def get_event_editor_and_object(
+    access: Tuple[User, Optional[RoleType], Optional[Event]] = Depends(get_event_access)
+) -> Tuple[Event, User]:
+    """
+    Dependency returning the event and a user who can edit it
+    """
+    user, role, event = access
+    return event, get_current_user_with_permission(RoleType.EDITOR, user, role)
+
+
+async def get_event_viewer_and_object(
+    access: Tuple[User, Optional[RoleType], Optional[Event]] = Depends(get_event_access)
+) -> Tuple[Event, User]:
+    """
+    Dependency returning the event and a user who can view it
+    """
+    user, role, event = access
+    return event, get_current_user_with_permission(RoleType.VIEWER, user, role)
\ No newline at end of file
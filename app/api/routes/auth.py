@@ -1,11 +1,11 @@
 
 from datetime import timedelta
 from typing import Any
-from app.api.deps import get_db, get_current_active_user
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+import jwt
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db, get_current_active_user
 from app.core.config import settings
@@ -18,43 +18,43 @@ router = APIRouter()
 
 
 @router.post("/register", response_model=UserSchema, status_code=status.HTTP_201_CREATED)
-def register_user(
+async def register_user(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     user_in: UserCreate
 ) -> Any:
     """
     Register a new user.
     """
 
-    user = user_crud.get_by_username(db, username=user_in.username)
+    user = await user_crud.get_by_username(db, username=user_in.username)
     if user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already exists"
         )
   
-    user = user_crud.get_by_email(db, email=user_in.email)
+    user = await user_crud.get_by_email(db, email=user_in.email)
     if user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
         
-    user = user_crud.create(db, obj_in=user_in)
+    user = await user_crud.create(db, obj_in=user_in)
     return user
 
 
 @router.post("/login", response_model=Token)
-def login_user(
+async def login_user(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     form_data: UserLogin
 ) -> Any:
     """
     Authenticate a user.
     """
-    user = user_crud.authenticate(
+    user = await user_crud.authenticate(
         db, username=form_data.username, password=form_data.password
     )
     if not user:
@@ -83,17 +83,14 @@ def login_user(
 
 
 @router.post("/refresh", response_model=Token)
-def refresh_token(
+async def refresh_token(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     refresh_token_in: RefreshToken
 ) -> Any:
     """
     Refresh an authentication token.
     """
-    from jose import jwt, JWTError
-    from app.schemas.user import TokenPayload
-    
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -104,21 +101,16 @@ def refresh_token(
         payload = jwt.decode(
             refresh_token_in.refresh_token, 
             settings.SECRET_KEY, 
-            algorithms=[settings.ALGORITHM]
+            algorithms=[settings.ALGORITHM],
+            options={"require": ["exp", "sub", "type"]},
         )
-        token_data = TokenPayload(**payload)
         
       
-        if token_data.type != "refresh":
-            raise credentials_exception
-            
-       
-        from datetime import datetime
-        if datetime.fromtimestamp(token_data.exp) < datetime.now():
+        if payload["type"] != "refresh":
             raise credentials_exception
             
-        user_id = token_data.sub
-        user = user_crud.get(db, id=int(user_id))
+        user_id = int(payload["sub"])
+        user = await user_crud.get(db, id=user_id)
         
         if not user:
             raise credentials_exception
@@ -145,12 +137,12 @@ def refresh_token(
             "token_type": "bearer"
         }
         
-    except (JWTError, ValidationError):
+    except (jwt.PyJWTError, ValueError):
         raise credentials_exception
 
 
 @router.post("/logout")
-def logout_user(
+async def logout_user(
     current_user: User = Depends(get_current_active_user)
 ) -> Any:
     """
@@ -1,84 +1,117 @@
 
-from typing import Any, List
+import asyncio
+from typing import Any, AsyncIterator, List, Tuple
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db, get_event_viewer
+from app.api.deps import get_db, get_event_viewer_and_object
+from app.core import cache
 from app.crud.changelog import changelog_crud
 from app.crud.event import event_crud
+from app.db.base import AsyncSessionLocal, run_in_session
+from app.models.event import Event
 from app.models.user import User
-from app.schemas.changelog import ChangeLogList, DiffResponse
+from app.schemas.changelog import ChangeLog, ChangeLogList, DiffResponse
 
 router = APIRouter()
 
 
 @router.get("/{id}/changelog", response_model=ChangeLogList)
-def get_event_changelog(
+async def get_event_changelog(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     id: int,
-    current_user: User = Depends(get_event_viewer)
+    skip: int = 0,
+    limit: int = 50,
+    event_and_user: Tuple[Event, User] = Depends(get_event_viewer_and_object)
 ) -> Any:
     """
     Get a chronological log of all changes to an event.
     """
-   
-    event = event_crud.get(db, id=id)
-    if not event:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Event not found"
-        )
-        
+    event, current_user = event_and_user
+    cached = await cache.get_changelog(event.id, skip, limit)
+    if cached is not None:
+        return cached
+    
+    changes, total = await asyncio.gather(
+        changelog_crud.get_event_changelog(db, event_id=event.id, skip=skip, limit=limit),
+        run_in_session(changelog_crud.count_event_changelog, event_id=event.id),
+    )
     
-    changes = changelog_crud.get_event_changelog(db, event_id=id)
+    page = skip // limit + 1 if limit > 0 else 1
+    pages = (total + limit - 1) // limit if limit > 0 else 1
     
-    return {
-        "event_id": id,
-        "changes": changes
-    }
+    changelog = ChangeLogList.model_validate(
+        {
+            "event_id": event.id,
+            "items": changes,
+            "total": total,
+            "page": page,
+            "page_size": limit,
+            "pages": pages
+        },
+        from_attributes=True
+    ).model_dump(mode="json")
+    await cache.set_changelog(event.id, skip, limit, changelog)
+    return changelog
+
+
+@router.get("/{id}/changelog/export")
+async def export_event_changelog(
+    *,
+    id: int,
+    event_and_user: Tuple[Event, User] = Depends(get_event_viewer_and_object)
+) -> Any:
+    """
+    Stream the full changelog of an event as newline-delimited JSON.
+    """
+    event, current_user = event_and_user
+    
+    async def generate() -> AsyncIterator[str]:
+        async with AsyncSessionLocal() as db:
+            async for entry in changelog_crud.stream_event_changelog(db, event_id=event.id):
+                yield ChangeLog.model_validate(entry, from_attributes=True).model_dump_json() + "\n"
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
 
 
 @router.get("/{id}/diff/{version_id1}/{version_id2}", response_model=DiffResponse)
-def get_version_diff(
+async def get_version_diff(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     id: int,
     version_id1: int,
     version_id2: int,
-    current_user: User = Depends(get_event_viewer)
+    event_and_user: Tuple[Event, User] = Depends(get_event_viewer_and_object)
 ) -> Any:
     """
     Get a diff between two versions.
     """
+    event, current_user = event_and_user
+    cached = await cache.get_diff(event.id, version_id1, version_id2)
+    if cached is not None:
+        return cached
   
-    event = event_crud.get(db, id=id)
-    if not event:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Event not found"
-        )
-        
-   
-    v1 = event_crud.get_version(db, event_id=id, version_number=version_id1)
+    versions = await event_crud.get_versions_fields(
+        db, event_id=event.id, version_numbers=[version_id1, version_id2]
+    )
+    v1 = versions.get(version_id1)
+    v2 = versions.get(version_id2)
     if not v1:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Version {version_id1} not found"
         )
         
-    v2 = event_crud.get_version(db, event_id=id, version_number=version_id2)
     if not v2:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Version {version_id2} not found"
         )
         
-    diff = changelog_crud.get_diff_between_versions(
-        db, 
-        event_id=id, 
-        version1=version_id1, 
-        version2=version_id2
-    )
+    diff = changelog_crud.build_version_diff(event.id, v1, v2)
     
+    diff = DiffResponse(**diff).model_dump(mode="json")
+    await cache.set_diff(event.id, version_id1, version_id2, diff)
     return diff
\ No newline at end of file
@@ -1,11 +1,12 @@
 
 from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db, get_event_owner, get_event_editor
+from app.api.deps import get_db, get_event_owner, get_event_editor, get_user_event_role
 from app.crud.permission import permission_crud
 from app.crud.user import user_crud
+from app.models.permission import RoleType
 from app.models.user import User
 from app.schemas.permission import (
     Permission, PermissionCreate, PermissionUpdate, 
@@ -16,9 +17,9 @@ router = APIRouter()
 
 
 @router.post("/{id}/share", response_model=List[Permission])
-def share_event(
+async def share_event(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     id: int,
     share_in: ShareEventRequest,
     current_user: User = Depends(get_event_owner)
@@ -26,42 +27,45 @@ def share_event(
     """
     Share an event with other users.
     """
-    created_permissions = []
-    
+    shares = {}
     for permission_in in share_in.users:
-        
-        user = user_crud.get(db, id=permission_in.user_id)
-        if not user:
+        shares[permission_in.user_id] = permission_in
+    users = sorted(shares.values(), key=lambda permission_in: permission_in.user_id)
+    
+    user_ids = [permission_in.user_id for permission_in in users]
+    existing_ids = await user_crud.get_existing_ids(db, ids=user_ids)
+    for user_id in user_ids:
+        if user_id not in existing_ids:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"User with id {permission_in.user_id} not found"
+                detail=f"User with id {user_id} not found"
             )
             
-      
-        event = db.query(permission_crud.model).filter_by(event_id=id, user_id=current_user.id).first()
-        if event and permission_in.user_id == current_user.id:
-            continue
-            
     
-        permission = permission_crud.create_with_event_user(
-            db=db, 
-            obj_in=PermissionCreate(
-                event_id=id,
-                user_id=permission_in.user_id,
-                role=permission_in.role
-            ),
-            created_by_id=current_user.id
+    permissions_in = [
+        PermissionCreate(
+            event_id=id,
+            user_id=permission_in.user_id,
+            role=permission_in.role
         )
+        for permission_in in users
+        if permission_in.user_id != current_user.id
+    ]
+    if not permissions_in:
+        return []
         
-        created_permissions.append(permission)
-    
-    return created_permissions
+    return await permission_crud.create_multi_with_event_users(
+        db=db,
+        event_id=id,
+        obj_ins=permissions_in,
+        created_by_id=current_user.id
+    )
 
 
 @router.get("/{id}/permissions", response_model=EventPermissionsList)
-def get_event_permissions(
+async def get_event_permissions(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     id: int,
     current_user: User = Depends(get_event_editor)
 ) -> Any:
@@ -69,7 +73,7 @@ def get_event_permissions(
     List all permissions for an event.
     """
    
-    users_with_permissions = permission_crud.get_event_users_with_permissions(db, event_id=id)
+    users_with_permissions = await permission_crud.get_event_users_with_permissions(db, event_id=id)
     
  
     permissions = []
@@ -90,32 +94,34 @@ def get_event_permissions(
 
 
 @router.put("/{id}/permissions/{user_id}", response_model=Permission)
-def update_permission(
+async def update_permission(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     id: int,
     user_id: int,
     permission_in: PermissionUpdate,
+    request: Request,
     current_user: User = Depends(get_event_owner)
 ) -> Any:
     """
     Update permissions for a user.
     """
 
-    user = user_crud.get(db, id=user_id)
+    user = await user_crud.get(db, id=user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
 
-    if permission_crud.check_user_is_owner(db, event_id=id, user_id=user_id):
+    role = await get_user_event_role(request, db, event_id=id, user_id=user_id)
+    if role == RoleType.OWNER:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot change owner's permission"
         )
 
-    permission = permission_crud.update_user_permission(
+    permission = await permission_crud.update_user_permission(
         db=db,
         event_id=id,
         user_id=user_id,
@@ -133,18 +139,19 @@ def update_permission(
 
 
 @router.delete("/{id}/permissions/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def remove_permission(
+async def remove_permission(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     id: int,
     user_id: int,
+    request: Request,
     current_user: User = Depends(get_event_owner)
 ) -> None:  
     """
     Remove access for a user.
     """
     
-    user = user_crud.get(db, id=user_id)
+    user = await user_crud.get(db, id=user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -152,14 +159,15 @@ def remove_permission(
         )
         
     
-    if permission_crud.check_user_is_owner(db, event_id=id, user_id=user_id):
+    role = await get_user_event_role(request, db, event_id=id, user_id=user_id)
+    if role == RoleType.OWNER:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot remove owner's permission"
         )
         
  
-    permission = permission_crud.remove_user_permission(
+    permission = await permission_crud.remove_user_permission(
         db=db,
         event_id=id,
         user_id=user_id,
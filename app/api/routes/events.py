@@ -1,39 +1,36 @@
 
-from typing import Any, List, Optional
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-import math
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db, get_current_active_user, get_event_owner, get_event_editor, get_event_viewer
+from app.api.deps import (
+    get_db, get_current_active_user,
+    get_event_owner_and_object, get_event_editor_and_object, get_event_viewer_and_object
+)
+from app.core.responses import MsgpackOrJSONResponse
 from app.crud.event import event_crud
+from app.models.event import Event as EventModel
 from app.models.user import User
 from app.schemas.event import (
     Event, EventCreate, EventUpdate, BatchEventCreate, 
-    EventFilterParams, EventListResponse
+    EventFilterParams, EventListResponse, EventListAdapter
 )
 
 router = APIRouter()
 
 
 @router.post("", response_model=Event, status_code=status.HTTP_201_CREATED)
-def create_event(
+async def create_event(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     event_in: EventCreate,
     current_user: User = Depends(get_current_active_user)
 ) -> Any:
     """
     Create a new event with current user as owner.
     """
-  
-    conflicts = event_crud.check_for_conflicts(
-        db, user_id=current_user.id, 
-        start_time=event_in.start_time, 
-        end_time=event_in.end_time
-    )
-    
-    # Create the event
-    event = event_crud.create_with_owner(
+    event = await event_crud.create_with_owner(
         db=db, obj_in=event_in, owner_id=current_user.id
     )
     
@@ -41,9 +38,9 @@ def create_event(
 
 
 @router.get("", response_model=EventListResponse)
-def read_events(
+async def read_events(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
     start_date: Optional[str] = None,
@@ -56,9 +53,6 @@ def read_events(
     """
     Retrieve events for current user with pagination and filtering.
     """
-    from datetime import datetime
-    
-    
     filter_params = EventFilterParams(
         start_date=datetime.fromisoformat(start_date) if start_date else None,
         end_date=datetime.fromisoformat(end_date) if end_date else None,
@@ -68,10 +62,7 @@ def read_events(
     )
     
    
-    total = event_crud.count_user_events(db, user_id=current_user.id, filter_params=filter_params)
-    
-   
-    events = event_crud.get_user_events(
+    events, total = await event_crud.get_user_events_with_total(
         db, user_id=current_user.id, 
         skip=skip, limit=limit,
         filter_params=filter_params
@@ -79,47 +70,43 @@ def read_events(
     
    
     page = skip // limit + 1 if limit > 0 else 1
-    pages = math.ceil(total / limit) if limit > 0 else 1
+    pages = (total + limit - 1) // limit if limit > 0 else 1
     
-    return {
-        "items": events,
+    return MsgpackOrJSONResponse({
+        "items": EventListAdapter.dump_python(events, mode="json", exclude_none=True),
         "total": total,
         "page": page,
         "page_size": limit,
         "pages": pages
-    }
+    })
 
 
 @router.get("/{id}", response_model=Event)
-def read_event(
+async def read_event(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     id: int,
-    current_user: User = Depends(get_event_viewer)
+    event_and_user: Tuple[EventModel, User] = Depends(get_event_viewer_and_object)
 ) -> Any:
     """
     Get event by ID.
     """
-    event = event_crud.get(db=db, id=id)
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
+    event, current_user = event_and_user
     return event
 
 
 @router.put("/{id}", response_model=Event)
-def update_event(
+async def update_event(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     id: int,
     event_in: EventUpdate,
-    current_user: User = Depends(get_event_editor)
+    event_and_user: Tuple[EventModel, User] = Depends(get_event_editor_and_object)
 ) -> Any:
     """
     Update an event.
     """
-    event = event_crud.get(db=db, id=id)
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
+    event, current_user = event_and_user
     
    
     if event_in.start_time or event_in.end_time:
@@ -132,19 +119,9 @@ def update_event(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="End time must be after start time"
             )
-        
-     
-        conflicts = event_crud.check_for_conflicts(
-            db, user_id=current_user.id, 
-            start_time=start_time, 
-            end_time=end_time
-        )
-        
-        
-        conflicts = [e for e in conflicts if e.id != id]
     
   
-    event = event_crud.update_with_version(
+    event = await event_crud.update_with_version(
         db=db, db_obj=event, obj_in=event_in, user_id=current_user.id
     )
     
@@ -152,27 +129,25 @@ def update_event(
 
 
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_event(
+async def delete_event(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     id: int,
-    current_user: User = Depends(get_event_owner)
+    event_and_user: Tuple[EventModel, User] = Depends(get_event_owner_and_object)
 ) -> None:  
     """
     Delete an event.
     """
-    event = event_crud.get(db=db, id=id)
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
+    event, current_user = event_and_user
     
-    event_crud.remove(db=db, id=id)
+    await event_crud.remove(db=db, id=event.id)
  
 
 
 @router.post("/batch", response_model=List[Event], status_code=status.HTTP_201_CREATED)
-def create_batch_events(
+async def create_batch_events(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     batch_in: BatchEventCreate,
     current_user: User = Depends(get_current_active_user)
 ) -> Any:
@@ -187,7 +162,7 @@ def create_batch_events(
         )
     
     
-    events = event_crud.create_batch(
+    events = await event_crud.create_batch(
         db=db, obj_ins=batch_in.events, owner_id=current_user.id
     )
     
@@ -1,10 +1,11 @@
 
-from typing import Any, List
+from typing import Any, List, Tuple
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db, get_event_viewer, get_event_editor
+from app.api.deps import get_db, get_event_viewer_and_object, get_event_editor_and_object
 from app.crud.event import event_crud
+from app.models.event import Event
 from app.models.user import User
 from app.schemas.event import EventVersion
 from app.schemas.changelog import RollbackRequest
@@ -13,26 +14,19 @@ router = APIRouter()
 
 
 @router.get("/{id}/history/{version_id}", response_model=EventVersion)
-def get_event_version(
+async def get_event_version(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     id: int,
     version_id: int,
-    current_user: User = Depends(get_event_viewer)
+    event_and_user: Tuple[Event, User] = Depends(get_event_viewer_and_object)
 ) -> Any:
     """
     Get a specific version of an event.
     """
-  
-    event = event_crud.get(db, id=id)
-    if not event:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Event not found"
-        )
-        
+    event, current_user = event_and_user
 
-    version = event_crud.get_version(db, event_id=id, version_number=version_id)
+    version = await event_crud.get_version(db, event_id=event.id, version_number=version_id)
     if not version:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -43,27 +37,22 @@ def get_event_version(
 
 
 @router.post("/{id}/rollback/{version_id}", response_model=EventVersion)
-def rollback_to_version(
+async def rollback_to_version(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     id: int,
     version_id: int,
     rollback_in: RollbackRequest = None,
-    current_user: User = Depends(get_event_editor)
+    event_and_user: Tuple[Event, User] = Depends(get_event_editor_and_object)
 ) -> Any:
     """
     Rollback to a previous version.
     """
+    event, current_user = event_and_user
     
-    event = event_crud.get(db, id=id)
-    if not event:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Event not found"
-        )
-        
-   
-    version = event_crud.get_version(db, event_id=id, version_number=version_id)
+    version = await event_crud.get_version(
+        db, event_id=event.id, version_number=version_id, fields_only=True
+    )
     if not version:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -82,18 +71,20 @@ def rollback_to_version(
     if rollback_in:
         comment = rollback_in.comment
         
-    updated_event = event_crud.rollback_to_version(
+    updated_event = await event_crud.rollback_to_version(
         db, 
-        event_id=id, 
+        event_id=event.id, 
         version_id=version_id, 
         user_id=current_user.id,
-        comment=comment
+        comment=comment,
+        event=event,
+        version=version
     )
     
 
-    new_version = event_crud.get_version(
+    new_version = await event_crud.get_version(
         db, 
-        event_id=id, 
+        event_id=event.id, 
         version_number=updated_event.current_version
     )
     
@@ -0,0 +1,146 @@
+
+import orjson
+from typing import Any, Optional
+
+import redis
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+
+
+CHANGELOG_TTL_SECONDS = 60
+ROLE_TTL_SECONDS = 600
+
+cache_client = aioredis.Redis(
+    host=settings.REDIS_HOST,
+    port=settings.REDIS_PORT,
+    password=settings.REDIS_PASSWORD,
+    socket_connect_timeout=1,
+)
+cache_enabled = False
+
+
+async def init_cache() -> None:
+    """
+    Enable the response cache if Redis is reachable
+    """
+    global cache_enabled
+    try:
+        await cache_client.ping()
+        cache_enabled = True
+    except (redis.ConnectionError, redis.TimeoutError):
+        cache_enabled = False
+
+
+def changelog_key(event_id: int) -> str:
+    return f"changelog:{event_id}"
+
+
+def diff_key(event_id: int) -> str:
+    return f"diff:{event_id}"
+
+
+def role_key(event_id: int) -> str:
+    return f"perm:{event_id}"
+
+
+async def get_changelog(event_id: int, skip: int, limit: int) -> Optional[Any]:
+    if not cache_enabled:
+        return None
+    try:
+        raw = await cache_client.hget(changelog_key(event_id), f"{skip}:{limit}")
+    except redis.RedisError:
+        return None
+    return orjson.loads(raw) if raw is not None else None
+
+
+async def set_changelog(event_id: int, skip: int, limit: int, value: Any) -> None:
+    """
+    Pages share one hash per event so a single delete invalidates all of them
+    """
+    if not cache_enabled:
+        return
+    try:
+        key = changelog_key(event_id)
+        async with cache_client.pipeline(transaction=False) as pipe:
+            pipe.hset(key, f"{skip}:{limit}", orjson.dumps(value))
+            pipe.expire(key, CHANGELOG_TTL_SECONDS)
+            await pipe.execute()
+    except redis.RedisError:
+        pass
+
+
+async def get_diff(event_id: int, version1: int, version2: int) -> Optional[Any]:
+    """
+    Version rows are immutable, so diffs are kept until the event is deleted
+    """
+    if not cache_enabled:
+        return None
+    try:
+        raw = await cache_client.hget(diff_key(event_id), f"{version1}:{version2}")
+    except redis.RedisError:
+        return None
+    return orjson.loads(raw) if raw is not None else None
+
+
+async def set_diff(event_id: int, version1: int, version2: int, value: Any) -> None:
+    if not cache_enabled:
+        return
+    try:
+        await cache_client.hset(diff_key(event_id), f"{version1}:{version2}", orjson.dumps(value))
+    except redis.RedisError:
+        pass
+
+
+async def get_role(event_id: int, user_id: int) -> Optional[str]:
+    """
+    Returns the cached role value, "" when the user is cached as having no
+    role, or None on a miss
+    """
+    if not cache_enabled:
+        return None
+    try:
+        raw = await cache_client.hget(role_key(event_id), str(user_id))
+    except redis.RedisError:
+        return None
+    return raw.decode() if raw is not None else None
+
+
+async def set_role(event_id: int, user_id: int, role: Optional[str]) -> None:
+    if not cache_enabled:
+        return
+    try:
+        key = role_key(event_id)
+        async with cache_client.pipeline(transaction=False) as pipe:
+            pipe.hset(key, str(user_id), role or "")
+            pipe.expire(key, ROLE_TTL_SECONDS)
+            await pipe.execute()
+    except redis.RedisError:
+        pass
+
+
+async def invalidate_roles(event_id: int) -> None:
+    if not cache_enabled:
+        return
+    try:
+        await cache_client.delete(role_key(event_id))
+    except redis.RedisError:
+        pass
+
+
+async def invalidate_changelog(event_id: int) -> None:
+    if not cache_enabled:
+        return
+    try:
+        await cache_client.delete(changelog_key(event_id))
+    except redis.RedisError:
+        pass
+
+
+async def invalidate_event(event_id: int) -> None:
+    if not cache_enabled:
+        return
+    try:
+        await cache_client.delete(changelog_key(event_id), diff_key(event_id), role_key(event_id))
+    except redis.RedisError:
+        pass
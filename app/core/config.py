@@ -1,7 +1,7 @@
 
-import os
+from functools import lru_cache
 from typing import Optional, Dict, Any, List, Union
-from pydantic import field_validator
+from pydantic import model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -10,19 +10,25 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api"
     
   
-    SECRET_KEY: str = os.getenv("SECRET_KEY", "supersecretkey")
+    SECRET_KEY: str = "supersecretkey"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     
    
-    DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./collaborative_events.db")
-    SQLALCHEMY_DATABASE_URI: str = DATABASE_URL
+    DATABASE_URL: str = "sqlite+aiosqlite:///./collaborative_events.db"
+    SQLALCHEMY_DATABASE_URI: Optional[str] = None
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_TIMEOUT: int = 30
+    DB_QUERY_CACHE_SIZE: int = 1200
+    AUTO_CREATE_TABLES: bool = True
     
    
-    REDIS_HOST: str = os.getenv("REDIS_HOST", "localhost")
-    REDIS_PORT: int = int(os.getenv("REDIS_PORT", "6379"))
-    REDIS_PASSWORD: Optional[str] = os.getenv("REDIS_PASSWORD")
+    REDIS_HOST: str = "localhost"
+    REDIS_PORT: int = 6379
+    REDIS_PASSWORD: Optional[str] = None
     
   
     RATE_LIMIT_PER_MINUTE: int = 60
@@ -36,5 +42,16 @@ class Settings(BaseSettings):
         extra="ignore",  
     )
 
+    @model_validator(mode="after")
+    def default_database_uri(self) -> "Settings":
+        if not self.SQLALCHEMY_DATABASE_URI:
+            self.SQLALCHEMY_DATABASE_URI = self.DATABASE_URL
+        return self
 
-settings = Settings()
\ No newline at end of file
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    return Settings()
+
+
+settings = get_settings()
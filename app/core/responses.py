@@ -0,0 +1,34 @@
+
+from contextvars import ContextVar
+from typing import Any, Mapping, Optional
+
+import msgpack
+from fastapi.responses import ORJSONResponse
+from starlette.background import BackgroundTask
+
+
+MSGPACK_MEDIA_TYPE = "application/x-msgpack"
+
+accepts_msgpack: ContextVar[bool] = ContextVar("accepts_msgpack", default=False)
+
+
+class MsgpackOrJSONResponse(ORJSONResponse):
+    """
+    JSON response that is packed as msgpack instead when the client asked for it
+    """
+    def __init__(
+        self,
+        content: Any,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        media_type: Optional[str] = None,
+        background: Optional[BackgroundTask] = None,
+    ) -> None:
+        if media_type is None and accepts_msgpack.get():
+            media_type = MSGPACK_MEDIA_TYPE
+        super().__init__(content, status_code, headers, media_type, background)
+
+    def render(self, content: Any) -> bytes:
+        if self.media_type == MSGPACK_MEDIA_TYPE:
+            return msgpack.packb(content)
+        return super().render(content)
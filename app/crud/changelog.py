@@ -1,7 +1,10 @@
 
-from typing import List, Dict, Any, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from operator import attrgetter
+from typing import AsyncIterator, List, Dict, Any, Optional
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import desc, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, raiseload
 
 from app.crud.base import CRUDBase
 from app.models.changelog import ChangeLog, ChangeType
@@ -9,68 +12,76 @@ from app.models.event import EventVersion
 from app.schemas.changelog import ChangeLogBase
 
 
+VERSION_FIELDS = ("title", "description", "start_time", "end_time", "location", "is_recurring", "recurrence_pattern")
+get_version_fields = attrgetter(*VERSION_FIELDS)
+
+# Diffs and rollbacks only read the versioned fields
+VERSION_FIELDS_ONLY = (
+    load_only(EventVersion.version_number, *(getattr(EventVersion, field) for field in VERSION_FIELDS)),
+    raiseload("*"),
+)
+
+
 class CRUDChangeLog(CRUDBase[ChangeLog, ChangeLogBase, ChangeLogBase]):
-    def get_event_changelog(self, db: Session, event_id: int) -> List[ChangeLog]:
-        """Get all changelog entries for an event, ordered by timestamp (newest first)"""
+    def _event_changelog_query(self, event_id: int):
         return (
-            db.query(ChangeLog)
+            select(ChangeLog)
             .filter(ChangeLog.event_id == event_id)
-            .order_by(desc(ChangeLog.timestamp))
-            .all()
+            .order_by(desc(ChangeLog.timestamp), desc(ChangeLog.id))
         )
     
-    def get_diff_between_versions(
-        self, db: Session, event_id: int, version1: int, version2: int
-    ) -> Dict[str, Any]:
-        """Generate a diff between two versions of an event"""
-     
-        v1 = (
-            db.query(EventVersion)
-            .filter(
-                EventVersion.event_id == event_id,
-                EventVersion.version_number == version1
-            )
-            .first()
+    async def get_event_changelog(
+        self, db: AsyncSession, event_id: int, skip: int = 0, limit: int = 50
+    ) -> List[ChangeLog]:
+        """Get a page of changelog entries for an event, ordered by timestamp (newest first)"""
+        result = await db.execute(
+            self._event_changelog_query(event_id).offset(skip).limit(limit)
         )
-        
-        v2 = (
-            db.query(EventVersion)
-            .filter(
-                EventVersion.event_id == event_id,
-                EventVersion.version_number == version2
-            )
-            .first()
+        return result.scalars().all()
+    
+    async def count_event_changelog(self, db: AsyncSession, event_id: int) -> int:
+        """Count changelog entries for an event"""
+        result = await db.execute(
+            select(func.count()).select_from(ChangeLog).filter(ChangeLog.event_id == event_id)
         )
-        
-        if not v1 or not v2:
-            return None
-            
-       
-        fields = ["title", "description", "start_time", "end_time", "location", "is_recurring", "recurrence_pattern"]
-   
-        diff = []
-        for field in fields:
-            old_value = getattr(v1, field)
-            new_value = getattr(v2, field)
-            
-            
-            if old_value != new_value:
-                diff.append({
-                    "field": field,
-                    "old_value": old_value,
-                    "new_value": new_value
-                })
-                
+        return result.scalar_one()
+    
+    async def stream_event_changelog(
+        self, db: AsyncSession, event_id: int
+    ) -> AsyncIterator[ChangeLog]:
+        """Stream every changelog entry for an event without loading the full history"""
+        result = await db.stream_scalars(
+            self._event_changelog_query(event_id).execution_options(yield_per=500)
+        )
+        async for entry in result:
+            yield entry
+    
+    def build_version_diff(
+        self, event_id: int, v1: EventVersion, v2: EventVersion
+    ) -> Dict[str, Any]:
+        """Generate a diff between two already loaded versions of an event, with JSON-safe values"""
+        diff = [
+            {
+                "field": field,
+                "old_value": jsonable_encoder(old_value),
+                "new_value": jsonable_encoder(new_value)
+            }
+            for field, old_value, new_value in zip(
+                VERSION_FIELDS, get_version_fields(v1), get_version_fields(v2)
+            )
+            if old_value != new_value
+        ]
+
         return {
             "event_id": event_id,
-            "version1": version1,
-            "version2": version2,
+            "version1": v1.version_number,
+            "version2": v2.version_number,
             "changes": diff
         }
     
-    def create_event_changelog(
+    async def create_event_changelog(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         event_id: int, 
         user_id: int, 
         change_type: ChangeType,
@@ -91,8 +102,8 @@ class CRUDChangeLog(CRUDBase[ChangeLog, ChangeLogBase, ChangeLogBase]):
         )
         
         db.add(changelog)
-        db.commit()
-        db.refresh(changelog)
+        await db.commit()
+        await db.refresh(changelog)
         return changelog
 
 
@@ -1,65 +1,86 @@
 
-from typing import Any, Dict, Optional, Union, List
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, func
+from typing import Any, Dict, Optional, Tuple, Union, List
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import bindparam, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
-import json
 
+from app.core import cache
 from app.crud.base import CRUDBase
+from app.crud.changelog import VERSION_FIELDS, VERSION_FIELDS_ONLY, get_version_fields
 from app.models.event import Event, EventVersion
 from app.models.permission import Permission, RoleType
 from app.models.changelog import ChangeLog, ChangeType
 from app.schemas.event import EventCreate, EventUpdate, EventFilterParams
 
 
+_VERSION_STMT = select(EventVersion).filter(
+    EventVersion.event_id == bindparam("event_id"),
+    EventVersion.version_number == bindparam("version_number")
+)
+_VERSION_FIELDS_STMT = _VERSION_STMT.options(*VERSION_FIELDS_ONLY)
+
+
 class CRUDEvent(CRUDBase[Event, EventCreate, EventUpdate]):
-    def create_with_owner(
-        self, db: Session, *, obj_in: EventCreate, owner_id: int
+    async def _insert_initial_rows(
+        self, db: AsyncSession, *, events: List[Event], owner_id: int
+    ) -> None:
+        """Insert the first version, owner permission and create entry for new events"""
+        await db.execute(
+            insert(EventVersion),
+            [
+                {
+                    "event_id": event.id,
+                    "version_number": 1,
+                    "title": event.title,
+                    "description": event.description,
+                    "start_time": event.start_time,
+                    "end_time": event.end_time,
+                    "location": event.location,
+                    "is_recurring": event.is_recurring,
+                    "recurrence_pattern": event.recurrence_pattern,
+                    "created_by_id": owner_id,
+                }
+                for event in events
+            ],
+        )
+        await db.execute(
+            insert(Permission),
+            [
+                {"event_id": event.id, "user_id": owner_id, "role": RoleType.OWNER}
+                for event in events
+            ],
+        )
+        await db.execute(
+            insert(ChangeLog),
+            [
+                {
+                    "event_id": event.id,
+                    "user_id": owner_id,
+                    "change_type": ChangeType.CREATE,
+                    "to_version": 1,
+                }
+                for event in events
+            ],
+        )
+
+    async def create_with_owner(
+        self, db: AsyncSession, *, obj_in: EventCreate, owner_id: int
     ) -> Event:
-        obj_in_data = obj_in.dict()
+        obj_in_data = obj_in.model_dump()
         db_obj = Event(**obj_in_data, owner_id=owner_id)
         db.add(db_obj)
-        db.flush()  
-
-      
-        version = EventVersion(
-            event_id=db_obj.id,
-            version_number=1,
-            title=db_obj.title,
-            description=db_obj.description,
-            start_time=db_obj.start_time,
-            end_time=db_obj.end_time,
-            location=db_obj.location,
-            is_recurring=db_obj.is_recurring,
-            recurrence_pattern=db_obj.recurrence_pattern,
-            created_by_id=owner_id,
-        )
-        db.add(version)
-
-    
-        permission = Permission(
-            event_id=db_obj.id,
-            user_id=owner_id,
-            role=RoleType.OWNER,
-        )
-        db.add(permission)
+        await db.flush()  
 
-     
-        changelog = ChangeLog(
-            event_id=db_obj.id,
-            user_id=owner_id,
-            change_type=ChangeType.CREATE,
-            to_version=1,
-        )
-        db.add(changelog)
+        await self._insert_initial_rows(db, events=[db_obj], owner_id=owner_id)
         
-        db.commit()
-        db.refresh(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
         return db_obj
 
-    def update_with_version(
+    async def update_with_version(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         db_obj: Event,
         obj_in: Union[EventUpdate, Dict[str, Any]],
@@ -72,7 +93,7 @@ class CRUDEvent(CRUDBase[Event, EventCreate, EventUpdate]):
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
-            update_data = obj_in.dict(exclude_unset=True)
+            update_data = obj_in.model_dump(exclude_unset=True)
             
        
         changes = {}
@@ -82,56 +103,83 @@ class CRUDEvent(CRUDBase[Event, EventCreate, EventUpdate]):
             
       
             if old_value != new_value:
-             
-                if hasattr(old_value, "__dict__"):
-                    old_value = old_value.__dict__
-                if hasattr(new_value, "__dict__"):
-                    new_value = new_value.__dict__
-                    
                 changes[field] = {
-                    "old": old_value,
-                    "new": new_value
+                    "old": jsonable_encoder(old_value),
+                    "new": jsonable_encoder(new_value)
                 }
         
    
-        version = EventVersion(
-            event_id=db_obj.id,
-            version_number=new_version_number,
-            title=update_data.get("title", db_obj.title),
-            description=update_data.get("description", db_obj.description),
-            start_time=update_data.get("start_time", db_obj.start_time),
-            end_time=update_data.get("end_time", db_obj.end_time),
-            location=update_data.get("location", db_obj.location),
-            is_recurring=update_data.get("is_recurring", db_obj.is_recurring),
-            recurrence_pattern=update_data.get("recurrence_pattern", db_obj.recurrence_pattern),
-            created_by_id=user_id,
+        version_data = {
+            field: update_data.get(field, value)
+            for field, value in zip(VERSION_FIELDS, get_version_fields(db_obj))
+        }
+        await db.execute(
+            insert(EventVersion).values(
+                event_id=db_obj.id,
+                version_number=new_version_number,
+                created_by_id=user_id,
+                **version_data
+            )
         )
-        db.add(version)
         
    
         update_data["current_version"] = new_version_number
         
       
-        updated_event = super().update(db, db_obj=db_obj, obj_in=update_data)
+        updated_event = await super().update(db, db_obj=db_obj, obj_in=update_data, commit=False)
         
    
         if changes:
-            changelog = ChangeLog(
-                event_id=db_obj.id,
-                user_id=user_id,
-                change_type=ChangeType.UPDATE,
-                from_version=db_obj.current_version,
-                to_version=new_version_number,
-                changes=changes,
+            await db.execute(
+                insert(ChangeLog).values(
+                    event_id=db_obj.id,
+                    user_id=user_id,
+                    change_type=ChangeType.UPDATE,
+                    from_version=new_version_number - 1,
+                    to_version=new_version_number,
+                    changes=changes,
+                )
             )
-            db.add(changelog)
-            db.commit()
+            
+        await db.commit()
+        await db.refresh(updated_event)
+        if changes:
+            await cache.invalidate_changelog(db_obj.id)
             
         return updated_event
 
-    def get_user_events(
+    async def remove(self, db: AsyncSession, *, id: int) -> Event:
+        event = await super().remove(db, id=id)
+        await cache.invalidate_event(id)
+        return event
+
+    def _supports_window_functions(self, db: AsyncSession) -> bool:
+        dialect = db.get_bind().dialect
+        if dialect.name == "sqlite":
+            return dialect.dbapi.sqlite_version_info >= (3, 25)
+        return True
+
+    def _apply_event_filters(self, query, filter_params: Optional[EventFilterParams]):
+        if filter_params:
+            if filter_params.start_date:
+                query = query.filter(Event.end_time >= filter_params.start_date)
+            if filter_params.end_date:
+                query = query.filter(Event.start_time <= filter_params.end_date)
+            if filter_params.title_search:
+                query = query.filter(
+                    func.lower(Event.title).like(f"%{filter_params.title_search.lower()}%")
+                )
+            if filter_params.location:
+                query = query.filter(
+                    func.lower(Event.location).like(f"%{filter_params.location.lower()}%")
+                )
+            if not filter_params.include_recurring:
+                query = query.filter(Event.is_recurring == False)
+        return query
+
+    async def get_user_events(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         user_id: int, 
         skip: int = 0, 
         limit: int = 100,
@@ -139,83 +187,117 @@ class CRUDEvent(CRUDBase[Event, EventCreate, EventUpdate]):
     ) -> List[Event]:
    
         query = (
-            db.query(Event)
+            select(Event)
             .join(Permission, Event.id == Permission.event_id)
             .filter(Permission.user_id == user_id)
         )
-        
-      
-        if filter_params:
-            if filter_params.start_date:
-                query = query.filter(Event.end_time >= filter_params.start_date)
-            if filter_params.end_date:
-                query = query.filter(Event.start_time <= filter_params.end_date)
-            if filter_params.title_search:
-                query = query.filter(Event.title.ilike(f"%{filter_params.title_search}%"))
-            if filter_params.location:
-                query = query.filter(Event.location.ilike(f"%{filter_params.location}%"))
-            if not filter_params.include_recurring:
-                query = query.filter(Event.is_recurring == False)
+        query = self._apply_event_filters(query, filter_params)
                 
-        return query.offset(skip).limit(limit).all()
+        result = await db.execute(query.offset(skip).limit(limit))
+        return result.scalars().all()
+    
+    async def get_user_events_with_total(
+        self, 
+        db: AsyncSession, 
+        user_id: int, 
+        skip: int = 0, 
+        limit: int = 100,
+        filter_params: Optional[EventFilterParams] = None
+    ) -> Tuple[List[Event], int]:
+        """Get a page of the user's events and the total match count in one query"""
+        if not self._supports_window_functions(db):
+            events = await self.get_user_events(
+                db, user_id=user_id, skip=skip, limit=limit, filter_params=filter_params
+            )
+            total = await self.count_user_events(db, user_id=user_id, filter_params=filter_params)
+            return events, total
+            
+        query = (
+            select(Event, func.count().over().label("total"))
+            .join(Permission, Event.id == Permission.event_id)
+            .filter(Permission.user_id == user_id)
+        )
+        query = self._apply_event_filters(query, filter_params)
+        
+        result = await db.execute(query.offset(skip).limit(limit))
+        rows = result.all()
+        if rows:
+            return [row.Event for row in rows], rows[0].total
+            
+        # An empty page carries no window value; a count is only needed past the end
+        if skip == 0 and limit > 0:
+            return [], 0
+        return [], await self.count_user_events(db, user_id=user_id, filter_params=filter_params)
     
-    def count_user_events(
+    async def count_user_events(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         user_id: int,
         filter_params: Optional[EventFilterParams] = None
     ) -> int:
       
         query = (
-            db.query(func.count(Event.id))
+            select(func.count(Event.id))
             .join(Permission, Event.id == Permission.event_id)
             .filter(Permission.user_id == user_id)
         )
         
-      
-        if filter_params:
-            if filter_params.start_date:
-                query = query.filter(Event.end_time >= filter_params.start_date)
-            if filter_params.end_date:
-                query = query.filter(Event.start_time <= filter_params.end_date)
-            if filter_params.title_search:
-                query = query.filter(Event.title.ilike(f"%{filter_params.title_search}%"))
-            if filter_params.location:
-                query = query.filter(Event.location.ilike(f"%{filter_params.location}%"))
-            if not filter_params.include_recurring:
-                query = query.filter(Event.is_recurring == False)
+        query = self._apply_event_filters(query, filter_params)
                 
-        return query.scalar()
+        result = await db.execute(query)
+        return result.scalar()
 
-    def get_version(self, db: Session, event_id: int, version_number: int) -> Optional[EventVersion]:
-        return (
-            db.query(EventVersion)
+    async def get_version(
+        self, db: AsyncSession, event_id: int, version_number: int, fields_only: bool = False
+    ) -> Optional[EventVersion]:
+        result = await db.execute(
+            _VERSION_FIELDS_STMT if fields_only else _VERSION_STMT,
+            {"event_id": event_id, "version_number": version_number}
+        )
+        return result.scalars().first()
+    
+    async def get_versions_fields(
+        self, db: AsyncSession, event_id: int, version_numbers: List[int]
+    ) -> Dict[int, EventVersion]:
+        """Load only the versioned fields of several versions, keyed by version number"""
+        result = await db.execute(
+            select(EventVersion)
+            .options(*VERSION_FIELDS_ONLY)
             .filter(
                 EventVersion.event_id == event_id,
-                EventVersion.version_number == version_number
+                EventVersion.version_number.in_(version_numbers)
             )
-            .first()
         )
+        return {version.version_number: version for version in result.scalars()}
     
-    def get_all_versions(self, db: Session, event_id: int) -> List[EventVersion]:
-        return (
-            db.query(EventVersion)
+    async def get_all_versions(self, db: AsyncSession, event_id: int) -> List[EventVersion]:
+        result = await db.execute(
+            select(EventVersion)
             .filter(EventVersion.event_id == event_id)
             .order_by(EventVersion.version_number)
-            .all()
         )
+        return result.scalars().all()
         
-    def rollback_to_version(
+    async def rollback_to_version(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         event_id: int, 
         version_id: int, 
         user_id: int,
-        comment: Optional[str] = None
+        comment: Optional[str] = None,
+        event: Optional[Event] = None,
+        version: Optional[EventVersion] = None
     ) -> Event:
-     
-        event = self.get(db, id=event_id)
-        version = self.get_version(db, event_id, version_id)
+        """
+        Roll an event back to a previous version.
+
+        `event` (attached to `db`) and `version` may be passed in when the
+        caller already loaded them, to skip re-fetching.
+        """
+        if event is None:
+            event = await self.get(db, id=event_id)
+        if version is None:
+            version = await self.get_version(db, event_id, version_id, fields_only=True)
         
         if not event or not version:
             return None
@@ -224,95 +306,91 @@ class CRUDEvent(CRUDBase[Event, EventCreate, EventUpdate]):
         new_version_number = event.current_version + 1
         
 
-        changes = {}
-        for field in ['title', 'description', 'start_time', 'end_time', 'location', 'is_recurring', 'recurrence_pattern']:
-            old_value = getattr(event, field)
-            new_value = getattr(version, field)
-            
-          
-            if old_value != new_value:
-                changes[field] = {
-                    "old": old_value,
-                    "new": new_value
-                }
+        old_values = get_version_fields(event)
+        new_values = get_version_fields(version)
+        changes = {
+            field: {"old": jsonable_encoder(old_value), "new": jsonable_encoder(new_value)}
+            for field, old_value, new_value in zip(VERSION_FIELDS, old_values, new_values)
+            if old_value != new_value
+        }
+        version_data = dict(zip(VERSION_FIELDS, new_values))
         
        
-        new_version = EventVersion(
-            event_id=event.id,
-            version_number=new_version_number,
-            title=version.title,
-            description=version.description,
-            start_time=version.start_time,
-            end_time=version.end_time,
-            location=version.location,
-            is_recurring=version.is_recurring,
-            recurrence_pattern=version.recurrence_pattern,
-            created_by_id=user_id,
+        await db.execute(
+            insert(EventVersion).values(
+                event_id=event.id,
+                version_number=new_version_number,
+                created_by_id=user_id,
+                **version_data
+            )
         )
-        db.add(new_version)
         
         
-        update_data = {
-            "title": version.title,
-            "description": version.description,
-            "start_time": version.start_time,
-            "end_time": version.end_time,
-            "location": version.location,
-            "is_recurring": version.is_recurring,
-            "recurrence_pattern": version.recurrence_pattern,
-            "current_version": new_version_number,
-        }
+        update_data = dict(version_data, current_version=new_version_number)
         
     
         for field, value in update_data.items():
             setattr(event, field, value)
         
         # Add rollback to changelog
-        changelog = ChangeLog(
-            event_id=event.id,
-            user_id=user_id,
-            change_type=ChangeType.ROLLBACK,
-            from_version=event.current_version,
-            to_version=new_version_number,
-            changes=changes,
-            comment=comment
+        await db.execute(
+            insert(ChangeLog).values(
+                event_id=event.id,
+                user_id=user_id,
+                change_type=ChangeType.ROLLBACK,
+                from_version=new_version_number - 1,
+                to_version=new_version_number,
+                changes=changes,
+                comment=comment
+            )
         )
-        db.add(changelog)
         
         db.add(event)
-        db.commit()
-        db.refresh(event)
+        await db.commit()
+        await db.refresh(event)
+        await cache.invalidate_changelog(event.id)
         
         return event
         
-    def check_for_conflicts(self, db: Session, user_id: int, start_time: datetime, end_time: datetime) -> List[Event]:
-        """Check for conflicting events in the time range"""
-        return (
-            db.query(Event)
+    async def check_for_conflicts(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        start_time: datetime,
+        end_time: datetime,
+        exclude_event_id: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[Event]:
+        """Check for events in the time range, touching endpoints included"""
+        query = (
+            select(Event)
             .join(Permission, Event.id == Permission.event_id)
             .filter(
                 Permission.user_id == user_id,
-                or_(
-                    and_(Event.start_time <= start_time, Event.end_time >= start_time),
-                    and_(Event.start_time <= end_time, Event.end_time >= end_time),
-                    and_(Event.start_time >= start_time, Event.end_time <= end_time),
-                )
+                Event.start_time <= end_time,
+                Event.end_time >= start_time,
             )
-            .all()
         )
+        if exclude_event_id is not None:
+            query = query.filter(Event.id != exclude_event_id)
+        if limit is not None:
+            query = query.limit(limit)
+        result = await db.execute(query)
+        return result.scalars().all()
         
-    def create_batch(
-        self, db: Session, *, obj_ins: List[EventCreate], owner_id: int
+    async def create_batch(
+        self, db: AsyncSession, *, obj_ins: List[EventCreate], owner_id: int
     ) -> List[Event]:
         """Create multiple events in a batch"""
-        created_events = []
+        result = await db.scalars(
+            insert(Event).returning(Event, sort_by_parameter_order=True),
+            [{**obj_in.model_dump(), "owner_id": owner_id} for obj_in in obj_ins],
+        )
+        created_events = result.all()
         
-
-        for obj_in in obj_ins:
-            event = self.create_with_owner(db, obj_in=obj_in, owner_id=owner_id)
-            created_events.append(event)
-            
+        await self._insert_initial_rows(db, events=created_events, owner_id=owner_id)
+        
+        await db.commit()
         return created_events
 
-
 event_crud = CRUDEvent(Event)
\ No newline at end of file
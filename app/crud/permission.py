@@ -1,7 +1,13 @@
 
 from typing import List, Optional, Union, Dict, Any
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
+from app.core import cache
+from app.db.base import utcnow
 from app.crud.base import CRUDBase
 from app.models.permission import Permission, RoleType
 from app.models.event import Event
@@ -10,33 +16,57 @@ from app.models.changelog import ChangeLog, ChangeType
 from app.schemas.permission import PermissionCreate, PermissionUpdate
 
 
+_USER_PERMISSION_STMT = select(Permission).filter(
+    Permission.event_id == bindparam("event_id"),
+    Permission.user_id == bindparam("user_id")
+)
+_USER_ROLE_STMT = select(Permission.role).filter(
+    Permission.event_id == bindparam("event_id"),
+    Permission.user_id == bindparam("user_id")
+)
+
+
 class CRUDPermission(CRUDBase[Permission, PermissionCreate, PermissionUpdate]):
-    def get_event_permissions(self, db: Session, event_id: int) -> List[Permission]:
-        return db.query(Permission).filter(Permission.event_id == event_id).all()
+    async def get_event_permissions(self, db: AsyncSession, event_id: int) -> List[Permission]:
+        result = await db.execute(
+            select(Permission)
+            .options(joinedload(Permission.user))
+            .filter(Permission.event_id == event_id)
+        )
+        return result.scalars().all()
     
-    def get_user_permission(self, db: Session, event_id: int, user_id: int) -> Optional[Permission]:
-        return (
-            db.query(Permission)
-            .filter(
-                Permission.event_id == event_id,
-                Permission.user_id == user_id
-            )
-            .first()
+    async def get_user_permission(self, db: AsyncSession, event_id: int, user_id: int) -> Optional[Permission]:
+        result = await db.execute(
+            _USER_PERMISSION_STMT, {"event_id": event_id, "user_id": user_id}
         )
+        return result.scalars().first()
     
-    def get_user_events(self, db: Session, user_id: int) -> List[Event]:
-        return (
-            db.query(Event)
+    async def get_user_role(self, db: AsyncSession, event_id: int, user_id: int) -> Optional[RoleType]:
+        """Get the user's role on an event, or None if they have no access"""
+        cached = await cache.get_role(event_id, user_id)
+        if cached is not None:
+            return RoleType(cached) if cached else None
+        
+        result = await db.execute(
+            _USER_ROLE_STMT, {"event_id": event_id, "user_id": user_id}
+        )
+        role = result.scalars().first()
+        await cache.set_role(event_id, user_id, role.value if role else None)
+        return role
+    
+    async def get_user_events(self, db: AsyncSession, user_id: int) -> List[Event]:
+        result = await db.execute(
+            select(Event)
             .join(Permission, Event.id == Permission.event_id)
             .filter(Permission.user_id == user_id)
-            .all()
         )
+        return result.scalars().all()
     
-    def create_with_event_user(
-        self, db: Session, *, obj_in: PermissionCreate, created_by_id: int
+    async def create_with_event_user(
+        self, db: AsyncSession, *, obj_in: PermissionCreate, created_by_id: int
     ) -> Permission:
         
-        existing = self.get_user_permission(
+        existing = await self.get_user_permission(
             db, event_id=obj_in.event_id, user_id=obj_in.user_id
         )
         
@@ -57,8 +87,10 @@ class CRUDPermission(CRUDBase[Permission, PermissionCreate, PermissionUpdate]):
                 }
             )
             db.add(changelog)
-            db.commit()
-            db.refresh(existing)
+            await db.commit()
+            await db.refresh(existing)
+            await cache.invalidate_changelog(obj_in.event_id)
+            await cache.invalidate_roles(obj_in.event_id)
             return existing
         else:
         
@@ -80,13 +112,72 @@ class CRUDPermission(CRUDBase[Permission, PermissionCreate, PermissionUpdate]):
                 }
             )
             db.add(changelog)
-            db.commit()
-            db.refresh(db_obj)
+            await db.commit()
+            await db.refresh(db_obj)
+            await cache.invalidate_changelog(obj_in.event_id)
+            await cache.invalidate_roles(obj_in.event_id)
             return db_obj
     
-    def update_user_permission(
+    async def create_multi_with_event_users(
+        self, db: AsyncSession, *, event_id: int, obj_ins: List[PermissionCreate], created_by_id: int
+    ) -> List[Permission]:
+        """Grant or update several users' permissions on an event with a single upsert"""
+        user_ids = [obj_in.user_id for obj_in in obj_ins]
+        result = await db.execute(
+            select(Permission.user_id, Permission.role)
+            .filter(
+                Permission.event_id == event_id,
+                Permission.user_id.in_(user_ids)
+            )
+        )
+        old_roles = dict(result.all())
+
+        dialect_insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+        stmt = dialect_insert(Permission).values([
+            {"event_id": event_id, "user_id": obj_in.user_id, "role": obj_in.role}
+            for obj_in in obj_ins
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Permission.event_id, Permission.user_id],
+            set_={"role": stmt.excluded.role, "updated_at": utcnow()}
+        ).returning(Permission)
+        result = await db.scalars(stmt, execution_options={"populate_existing": True})
+        saved = sorted(result.all(), key=lambda permission: permission.user_id)
+
+        changelog_rows = []
+        for obj_in in obj_ins:
+            old_role = old_roles.get(obj_in.user_id)
+            if old_role:
+                changelog_rows.append({
+                    "event_id": event_id,
+                    "user_id": created_by_id,
+                    "change_type": ChangeType.PERMISSION_CHANGE,
+                    "changes": {
+                        "user_id": obj_in.user_id,
+                        "old_role": old_role.value,
+                        "new_role": obj_in.role.value
+                    }
+                })
+            else:
+                changelog_rows.append({
+                    "event_id": event_id,
+                    "user_id": created_by_id,
+                    "change_type": ChangeType.SHARE,
+                    "changes": {
+                        "user_id": obj_in.user_id,
+                        "role": obj_in.role.value
+                    }
+                })
+        await db.execute(insert(ChangeLog), changelog_rows)
+
+        await db.commit()
+        await cache.invalidate_changelog(event_id)
+        await cache.invalidate_roles(event_id)
+        return saved
+    
+    async def update_user_permission(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         event_id: int,
         user_id: int,
@@ -94,7 +185,7 @@ class CRUDPermission(CRUDBase[Permission, PermissionCreate, PermissionUpdate]):
         updated_by_id: int
     ) -> Permission:
        
-        db_obj = self.get_user_permission(db, event_id=event_id, user_id=user_id)
+        db_obj = await self.get_user_permission(db, event_id=event_id, user_id=user_id)
         
         if not db_obj:
             return None
@@ -103,7 +194,7 @@ class CRUDPermission(CRUDBase[Permission, PermissionCreate, PermissionUpdate]):
         old_role = db_obj.role
         
         
-        db_obj = super().update(db, db_obj=db_obj, obj_in=obj_in)
+        db_obj = await super().update(db, db_obj=db_obj, obj_in=obj_in)
         
       
         if old_role != db_obj.role:
@@ -118,15 +209,17 @@ class CRUDPermission(CRUDBase[Permission, PermissionCreate, PermissionUpdate]):
                 }
             )
             db.add(changelog)
-            db.commit()
+            await db.commit()
+            await cache.invalidate_changelog(event_id)
+        await cache.invalidate_roles(event_id)
             
         return db_obj
     
-    def remove_user_permission(
-        self, db: Session, *, event_id: int, user_id: int, removed_by_id: int
+    async def remove_user_permission(
+        self, db: AsyncSession, *, event_id: int, user_id: int, removed_by_id: int
     ) -> Permission:
      
-        db_obj = self.get_user_permission(db, event_id=event_id, user_id=user_id)
+        db_obj = await self.get_user_permission(db, event_id=event_id, user_id=user_id)
         
         if not db_obj:
             return None
@@ -135,7 +228,7 @@ class CRUDPermission(CRUDBase[Permission, PermissionCreate, PermissionUpdate]):
         old_role = db_obj.role
         
      
-        db.delete(db_obj)
+        await db.delete(db_obj)
         
        
         changelog = ChangeLog(
@@ -149,37 +242,16 @@ class CRUDPermission(CRUDBase[Permission, PermissionCreate, PermissionUpdate]):
             }
         )
         db.add(changelog)
-        db.commit()
+        await db.commit()
+        await cache.invalidate_changelog(event_id)
+        await cache.invalidate_roles(event_id)
         
         return db_obj
     
-    def check_user_can_edit(self, db: Session, event_id: int, user_id: int) -> bool:
-        """Check if user has edit permissions (OWNER or EDITOR)"""
-        permission = self.get_user_permission(db, event_id=event_id, user_id=user_id)
-        
-        if not permission:
-            return False
-            
-        return permission.role in [RoleType.OWNER, RoleType.EDITOR]
-    
-    def check_user_can_view(self, db: Session, event_id: int, user_id: int) -> bool:
-        """Check if user has any viewing permissions"""
-        permission = self.get_user_permission(db, event_id=event_id, user_id=user_id)
-        return permission is not None
-    
-    def check_user_is_owner(self, db: Session, event_id: int, user_id: int) -> bool:
-        """Check if user is the owner"""
-        permission = self.get_user_permission(db, event_id=event_id, user_id=user_id)
-        
-        if not permission:
-            return False
-            
-        return permission.role == RoleType.OWNER
-    
-    def get_event_users_with_permissions(self, db: Session, event_id: int) -> List[Dict]:
+    async def get_event_users_with_permissions(self, db: AsyncSession, event_id: int) -> List[Dict]:
         """Get all users with their permissions for an event"""
-        return (
-            db.query(
+        result = await db.execute(
+            select(
                 Permission.user_id,
                 Permission.role,
                 User.username,
@@ -187,8 +259,8 @@ class CRUDPermission(CRUDBase[Permission, PermissionCreate, PermissionUpdate]):
             )
             .join(User, Permission.user_id == User.id)
             .filter(Permission.event_id == event_id)
-            .all()
         )
+        return result.all()
 
 
 permission_crud = CRUDPermission(Permission)
\ No newline at end of file
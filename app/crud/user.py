@@ -1,51 +1,79 @@
 
-from typing import Any, Dict, Optional, Union, List
-from sqlalchemy.orm import Session
+from typing import Any, Dict, Optional, Set, Tuple, Union, List
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import get_password_hash, verify_password
 from app.crud.base import CRUDBase
+from app.models.event import Event
+from app.models.permission import Permission, RoleType
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 
 
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
-    def get_by_email(self, db: Session, *, email: str) -> Optional[User]:
-        return db.query(User).filter(User.email == email).first()
+    async def get_by_email(self, db: AsyncSession, *, email: str) -> Optional[User]:
+        result = await db.execute(select(User).filter(User.email == email))
+        return result.scalars().first()
 
-    def get_by_username(self, db: Session, *, username: str) -> Optional[User]:
-        return db.query(User).filter(User.username == username).first()
+    async def get_by_username(self, db: AsyncSession, *, username: str) -> Optional[User]:
+        result = await db.execute(select(User).filter(User.username == username))
+        return result.scalars().first()
 
-    def create(self, db: Session, *, obj_in: UserCreate) -> User:
+    async def get_with_event_permission(
+        self, db: AsyncSession, *, user_id: int, event_id: int
+    ) -> Optional[Tuple[User, Optional[RoleType], Optional[Event]]]:
+        """Get a user, their role on an event and the event itself in one query"""
+        result = await db.execute(
+            select(User, Permission.role, Event)
+            .outerjoin(
+                Permission,
+                and_(Permission.user_id == User.id, Permission.event_id == event_id)
+            )
+            .outerjoin(Event, Event.id == Permission.event_id)
+            .filter(User.id == user_id)
+        )
+        return result.first()
+
+    async def get_existing_ids(self, db: AsyncSession, *, ids: List[int]) -> Set[int]:
+        """Return the subset of ids that belong to existing users"""
+        result = await db.execute(select(User.id).filter(User.id.in_(ids)))
+        return set(result.scalars().all())
+
+    async def create(self, db: AsyncSession, *, obj_in: UserCreate) -> User:
+        # bcrypt is CPU-bound, keep it off the event loop
+        hashed_password = await run_in_threadpool(get_password_hash, obj_in.password)
         db_obj = User(
             email=obj_in.email,
             username=obj_in.username,
-            hashed_password=get_password_hash(obj_in.password),
+            hashed_password=hashed_password,
             full_name=obj_in.full_name,
             is_active=obj_in.is_active,
         )
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
         return db_obj
 
-    def update(
-        self, db: Session, *, db_obj: User, obj_in: Union[UserUpdate, Dict[str, Any]]
+    async def update(
+        self, db: AsyncSession, *, db_obj: User, obj_in: Union[UserUpdate, Dict[str, Any]]
     ) -> User:
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
-            update_data = obj_in.dict(exclude_unset=True)
+            update_data = obj_in.model_dump(exclude_unset=True)
         if "password" in update_data and update_data["password"]:
-            hashed_password = get_password_hash(update_data["password"])
+            hashed_password = await run_in_threadpool(get_password_hash, update_data["password"])
             del update_data["password"]
             update_data["hashed_password"] = hashed_password
-        return super().update(db, db_obj=db_obj, obj_in=update_data)
+        return await super().update(db, db_obj=db_obj, obj_in=update_data)
 
-    def authenticate(self, db: Session, *, username: str, password: str) -> Optional[User]:
-        user = self.get_by_username(db, username=username)
+    async def authenticate(self, db: AsyncSession, *, username: str, password: str) -> Optional[User]:
+        user = await self.get_by_username(db, username=username)
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        if not await run_in_threadpool(verify_password, password, user.hashed_password):
             return None
         return user
 
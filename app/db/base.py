@@ -1,20 +1,81 @@
 
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from typing import Any, Awaitable, Callable, TypeVar
+
+import orjson
+
+from sqlalchemy import DateTime
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.sql.expression import FunctionElement
 
 from app.core.config import settings
 
 
+def _json_serializer(value: Any) -> str:
+    return orjson.dumps(value).decode()
+
+
 if settings.SQLALCHEMY_DATABASE_URI.startswith("sqlite"):
-    engine = create_engine(
+    engine = create_async_engine(
         settings.SQLALCHEMY_DATABASE_URI, 
-        connect_args={"check_same_thread": False}
+        connect_args={"check_same_thread": False},
+        query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+        json_serializer=_json_serializer,
+        json_deserializer=orjson.loads,
     )
 else:
-    engine = create_engine(settings.SQLALCHEMY_DATABASE_URI)
+    engine = create_async_engine(
+        settings.SQLALCHEMY_DATABASE_URI,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=True,
+        query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+        json_serializer=_json_serializer,
+        json_deserializer=orjson.loads,
+    )
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+T = TypeVar("T")
+
+
+async def run_in_session(fn: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a CRUD call on its own short-lived session.
+
+    An AsyncSession can only run one statement at a time, so reads that are
+    gathered alongside work on the request session need a session of their own.
+    """
+    async with AsyncSessionLocal() as session:
+        return await fn(session, *args, **kwargs)
+
+
+class utcnow(FunctionElement):
+    """
+    Current UTC time as a naive timestamp, evaluated by the database
+    """
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _compile_utcnow(element: utcnow, compiler: Any, **kw: Any) -> str:
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "postgresql")
+def _compile_utcnow_postgresql(element: utcnow, compiler: Any, **kw: Any) -> str:
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+@compiles(utcnow, "sqlite")
+def _compile_utcnow_sqlite(element: utcnow, compiler: Any, **kw: Any) -> str:
+    return "STRFTIME('%Y-%m-%d %H:%M:%f', 'now')"
 
 
-Base = declarative_base()
\ No newline at end of file
+Base = declarative_base()
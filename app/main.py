@@ -4,18 +4,34 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.openapi.utils import get_openapi
 from fastapi.responses import JSONResponse, HTMLResponse
-import msgpack
+import asyncio
+import contextlib
 import redis
+import redis.asyncio as aioredis
 import time
-from typing import Callable, List
+from typing import AsyncIterator, Callable, List
 
+from app.core import cache
 from app.core.config import settings
+from app.core.responses import MSGPACK_MEDIA_TYPE, MsgpackOrJSONResponse, accepts_msgpack
 from app.api.routes import auth, events, collaboration, history, changelog
 from app.db.base import Base, engine
 from app.api.deps import get_db
 
 
-Base.metadata.create_all(bind=engine)
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    if settings.AUTO_CREATE_TABLES:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    await cache.init_cache()
+    probe = asyncio.create_task(probe_redis())
+    yield
+    probe.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await probe
+    await engine.dispose()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -25,6 +41,8 @@ app = FastAPI(
     docs_url=None,
     redoc_url=None,
     openapi_version="3.0.2",
+    default_response_class=MsgpackOrJSONResponse,
+    lifespan=lifespan,
 )
 
 
@@ -38,21 +56,47 @@ if settings.BACKEND_CORS_ORIGINS:
     )
 
 
-USE_REDIS = True
-try:
-    redis_client = redis.Redis(
-        host=settings.REDIS_HOST,
-        port=settings.REDIS_PORT,
-        password=settings.REDIS_PASSWORD,
-        decode_responses=True,
-        socket_connect_timeout=1, 
-    )
- 
-    redis_client.ping()
-    print("Redis connection successful. Rate limiting enabled.")
-except (redis.ConnectionError, redis.exceptions.TimeoutError):
-    print("Warning: Redis connection failed. Rate limiting will be disabled.")
-    USE_REDIS = False
+# Increment the per-minute counter and start its TTL in one round trip
+RATE_LIMIT_SCRIPT = """
+local current = redis.call('INCR', KEYS[1])
+if current == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return current
+"""
+
+redis_client = aioredis.Redis(
+    host=settings.REDIS_HOST,
+    port=settings.REDIS_PORT,
+    password=settings.REDIS_PASSWORD,
+    decode_responses=True,
+    socket_connect_timeout=1,
+)
+rate_limit_script = redis_client.register_script(RATE_LIMIT_SCRIPT)
+
+REDIS_PROBE_INTERVAL_SECONDS = 10
+redis_available = False
+
+
+async def probe_redis() -> None:
+    """
+    Keep redis_available in step with the Redis server so rate limiting
+    switches itself off during an outage and back on once it recovers
+    """
+    global redis_available
+    while True:
+        try:
+            await redis_client.ping()
+            available = True
+        except redis.RedisError:
+            available = False
+        if available != redis_available:
+            if available:
+                print("Redis connection successful. Rate limiting enabled.")
+            else:
+                print("Warning: Redis connection failed. Rate limiting will be disabled.")
+            redis_available = available
+        await asyncio.sleep(REDIS_PROBE_INTERVAL_SECONDS)
 
 
 
@@ -62,7 +106,8 @@ async def rate_limit_middleware(request: Request, call_next: Callable) -> Respon
     Middleware for rate limiting
     """
    
-    if not USE_REDIS:
+    global redis_available
+    if not redis_available:
         return await call_next(request)
         
   
@@ -70,18 +115,13 @@ async def rate_limit_middleware(request: Request, call_next: Callable) -> Respon
         return await call_next(request)
     
   
-    client_ip = request.client.host
+    client_ip = request.client.host if request.client else "unknown"
     
 
     minute_key = f"rate_limit:{client_ip}:{int(time.time()) // 60}"
     
     try:
-     
-        current = redis_client.incr(minute_key)
-        
-   
-        if current == 1:
-            redis_client.expire(minute_key, 60)
+        current = await rate_limit_script(keys=[minute_key], args=[60])
         
        
         if current > settings.RATE_LIMIT_PER_MINUTE:
@@ -89,9 +129,8 @@ async def rate_limit_middleware(request: Request, call_next: Callable) -> Respon
                 status_code=429,
                 content={"detail": "Rate limit exceeded"}
             )
-    except:
-
-        pass
+    except redis.RedisError:
+        redis_available = False
     
     return await call_next(request)
 
@@ -102,35 +141,8 @@ async def content_negotiation_middleware(request: Request, call_next: Callable)
     """
     Middleware for content negotiation
     """
-    response = await call_next(request)
-    
-    
-    accept = request.headers.get("Accept", "")
-    
-    
-    if "application/x-msgpack" in accept and response.headers.get("content-type") == "application/json":
-        response_body = b""
-        async for chunk in response.body_iterator:
-            response_body += chunk
-        
-     
-        import json
-        try:
-            data = json.loads(response_body)
-            msgpack_data = msgpack.packb(data)
-            
-        
-            return Response(
-                content=msgpack_data,
-                status_code=response.status_code,
-                headers=dict(response.headers),
-                media_type="application/x-msgpack"
-            )
-        except:
- 
-            pass
-    
-    return response
+    accepts_msgpack.set(MSGPACK_MEDIA_TYPE in request.headers.get("Accept", ""))
+    return await call_next(request)
 
 
 
@@ -1,10 +1,10 @@
 
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, JSON, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, JSON, Text, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
-from datetime import datetime
 import enum
 
-from app.db.base import Base
+from app.db.base import Base, utcnow
 
 
 class ChangeType(str, enum.Enum):
@@ -22,13 +22,18 @@ class ChangeLog(Base):
     id = Column(Integer, primary_key=True, index=True)
     event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    timestamp = Column(DateTime, default=datetime.utcnow)
-    change_type = Column(Enum(ChangeType), nullable=False)
+    timestamp = Column(DateTime, server_default=utcnow())
+    change_type = Column(Enum(ChangeType, name="changetype", create_constraint=True), nullable=False)
     from_version = Column(Integer, nullable=True)
     to_version = Column(Integer, nullable=True)
-    changes = Column(JSON, nullable=True)  
+    changes = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)  
     comment = Column(Text, nullable=True)
 
     
     event = relationship("Event", back_populates="changelog")
-    user = relationship("User", back_populates="event_changes")
\ No newline at end of file
+    user = relationship("User", back_populates="event_changes")
+
+    __table_args__ = (
+        Index("ix_changelog_event_ts", event_id, timestamp.desc()),
+        Index("ix_changelog_changes", changes, postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
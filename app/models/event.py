@@ -1,13 +1,14 @@
 
-from sqlalchemy import Boolean, Column, Integer, String, DateTime, ForeignKey, Text, JSON
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, ForeignKey, Text, JSON, Index, UniqueConstraint, DDL, event, func
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
-from datetime import datetime
 
-from app.db.base import Base
+from app.db.base import Base, utcnow
 
 
 class Event(Base):
     __tablename__ = "events"
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True, nullable=False)
@@ -16,17 +17,43 @@ class Event(Base):
     end_time = Column(DateTime, nullable=False)
     location = Column(String)
     is_recurring = Column(Boolean, default=False)
-    recurrence_pattern = Column(JSON, nullable=True)  
+    recurrence_pattern = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)  
     owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     current_version = Column(Integer, default=1)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow())
+    updated_at = Column(DateTime, server_default=utcnow(), onupdate=utcnow())
 
 
     owner = relationship("User", back_populates="events")
     permissions = relationship("Permission", back_populates="event", cascade="all, delete-orphan")
-    versions = relationship("EventVersion", back_populates="event", cascade="all, delete-orphan")
-    changelog = relationship("ChangeLog", back_populates="event", cascade="all, delete-orphan")
+    # History collections are never needed on list paths; load them explicitly
+    versions = relationship("EventVersion", back_populates="event", cascade="all, delete-orphan", lazy="raise")
+    changelog = relationship("ChangeLog", back_populates="event", cascade="all, delete-orphan", lazy="raise")
+
+    __table_args__ = (
+        Index("ix_events_owner_start", "owner_id", "start_time"),
+        Index("ix_events_start_end", "start_time", "end_time"),
+        Index(
+            "ix_events_title_trgm",
+            func.lower(title).label("lower_title"),
+            postgresql_using="gin",
+            postgresql_ops={"lower_title": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_events_location_trgm",
+            func.lower(location).label("lower_location"),
+            postgresql_using="gin",
+            postgresql_ops={"lower_location": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
+
+
+# The trigram indexes on Event need pg_trgm installed before the table is created
+event.listen(
+    Event.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
 
 
 class EventVersion(Base):
@@ -41,13 +68,14 @@ class EventVersion(Base):
     end_time = Column(DateTime, nullable=False)
     location = Column(String)
     is_recurring = Column(Boolean, default=False)
-    recurrence_pattern = Column(JSON, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    recurrence_pattern = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)
+    created_at = Column(DateTime, server_default=utcnow())
     created_by_id = Column(Integer, ForeignKey("users.id"), nullable=False)
 
  
     event = relationship("Event", back_populates="versions")
     created_by = relationship("User")
 
-    class Config:
-        unique_together = ("event_id", "version_number")
\ No newline at end of file
+    __table_args__ = (
+        UniqueConstraint("event_id", "version_number", name="uq_version_event_number"),
+    )
\ No newline at end of file
@@ -1,10 +1,9 @@
 
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, Index
 from sqlalchemy.orm import relationship
-from datetime import datetime
 import enum
 
-from app.db.base import Base
+from app.db.base import Base, utcnow
 
 
 class RoleType(str, enum.Enum):
@@ -13,19 +12,29 @@ class RoleType(str, enum.Enum):
     VIEWER = "viewer"
 
 
+ROLE_RANK = {
+    RoleType.VIEWER: 1,
+    RoleType.EDITOR: 2,
+    RoleType.OWNER: 3,
+}
+
+
 class Permission(Base):
     __tablename__ = "permissions"
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    role = Column(Enum(RoleType), default=RoleType.VIEWER, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    role = Column(Enum(RoleType, name="roletype", create_constraint=True), default=RoleType.VIEWER, nullable=False)
+    created_at = Column(DateTime, server_default=utcnow())
+    updated_at = Column(DateTime, server_default=utcnow(), onupdate=utcnow())
 
    
     event = relationship("Event", back_populates="permissions")
-    user = relationship("User", back_populates="permissions")
+    user = relationship("User", back_populates="permissions", lazy="joined")
 
-    class Config:
-        unique_together = ("event_id", "user_id")
\ No newline at end of file
+    __table_args__ = (
+        Index("ix_perm_event_user", "event_id", "user_id", unique=True),
+        Index("ix_perm_user_event", "user_id", "event_id"),
+    )
\ No newline at end of file
@@ -1,9 +1,10 @@
 
-from typing import Optional, Dict, Any, List
-from pydantic import BaseModel
+from typing import Optional, Dict, List
+from pydantic import BaseModel, JsonValue
 from datetime import datetime
 
 from app.models.changelog import ChangeType
+from app.schemas.event import PaginatedResponse
 
 
 
@@ -11,7 +12,7 @@ class ChangeLogBase(BaseModel):
     change_type: ChangeType
     from_version: Optional[int] = None
     to_version: Optional[int] = None
-    changes: Optional[Dict[str, Any]] = None
+    changes: Optional[Dict[str, JsonValue]] = None
     comment: Optional[str] = None
 
 
@@ -22,8 +23,7 @@ class ChangeLogInDBBase(ChangeLogBase):
     user_id: int
     timestamp: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = {"from_attributes": True}
 
 
 
@@ -32,16 +32,16 @@ class ChangeLog(ChangeLogInDBBase):
 
 
 
-class ChangeLogList(BaseModel):
+class ChangeLogList(PaginatedResponse):
     event_id: int
-    changes: List[ChangeLog]
+    items: List[ChangeLog]
 
 
 
 class FieldChange(BaseModel):
     field: str
-    old_value: Optional[Any] = None
-    new_value: Optional[Any] = None
+    old_value: Optional[JsonValue] = None
+    new_value: Optional[JsonValue] = None
 
 
 
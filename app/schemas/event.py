@@ -1,6 +1,6 @@
 
 from typing import Optional, Dict, Any, List
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, TypeAdapter, model_validator
 from datetime import datetime
 
 
@@ -25,11 +25,11 @@ class EventBase(BaseModel):
     is_recurring: bool = False
     recurrence_pattern: Optional[RecurrencePattern] = None
 
-    @validator("end_time")
-    def end_time_must_be_after_start_time(cls, v, values):
-        if "start_time" in values and v < values["start_time"]:
+    @model_validator(mode="after")
+    def end_time_must_be_after_start_time(self):
+        if self.end_time < self.start_time:
             raise ValueError("end_time must be after start_time")
-        return v
+        return self
 
 
 
@@ -56,8 +56,7 @@ class EventInDBBase(EventBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = {"from_attributes": True}
 
 
 
@@ -66,6 +65,20 @@ class Event(EventInDBBase):
 
 
 
+class EventList(BaseModel):
+    id: int
+    title: str
+    start_time: datetime
+    end_time: datetime
+
+    model_config = {"from_attributes": True}
+
+
+# Serializes list pages in one pass; EventListResponse stays for OpenAPI
+EventListAdapter = TypeAdapter(List[EventList])
+
+
+
 class EventVersion(BaseModel):
     version_number: int
     title: str
@@ -78,8 +91,7 @@ class EventVersion(BaseModel):
     created_at: datetime
     created_by_id: int
 
-    class Config:
-        orm_mode = True
+    model_config = {"from_attributes": True}
 
 
 
@@ -106,4 +118,4 @@ class PaginatedResponse(BaseModel):
 
 
 class EventListResponse(PaginatedResponse):
-    items: List[Event]
\ No newline at end of file
+    items: List[EventList]
\ No newline at end of file
@@ -30,8 +30,7 @@ class PermissionInDBBase(PermissionBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = {"from_attributes": True}
 
 
 
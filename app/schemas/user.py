@@ -1,6 +1,6 @@
 
-from typing import Optional, List, ClassVar, Dict, Any
-from pydantic import BaseModel, EmailStr, field_validator
+from typing import Annotated, Optional, List, ClassVar, Dict, Any
+from pydantic import BaseModel, EmailStr, StringConstraints
 from datetime import datetime
 
 
@@ -14,13 +14,7 @@ class UserBase(BaseModel):
 
 
 class UserCreate(UserBase):
-    password: str
-
-    @field_validator("password")
-    def password_min_length(cls, v):
-        if len(v) < 8:
-            raise ValueError("Password must be at least 8 characters long")
-        return v
+    password: Annotated[str, StringConstraints(min_length=8)]
 
 
 
@@ -1,48 +1,33 @@
 
-import json
+import orjson
 from typing import Any, Dict, List, Optional, Union
 from datetime import datetime
 
 
+def _serialize_fallback(value: Any) -> Any:
+    if hasattr(value, "__dict__"):
+        return value.__dict__
+    return str(value)
+
+
+def _dumps(value: Any) -> bytes:
+    return orjson.dumps(value, default=_serialize_fallback, option=orjson.OPT_SORT_KEYS)
+
+
 def serialize_value(value: Any) -> Any:
     """
     Serialize complex values for comparison and storage
     """
-    if value is None:
-        return None
-    
-    if isinstance(value, (str, int, float, bool)):
-        return value
-    
-    if isinstance(value, datetime):
-        return value.isoformat()
-    
-    if isinstance(value, dict):
-        return {k: serialize_value(v) for k, v in value.items()}
-    
-    if isinstance(value, list):
-        return [serialize_value(item) for item in value]
-    
-    
-    if hasattr(value, "__dict__"):
-        return serialize_value(value.__dict__)
-    
-    
-    return str(value)
+    return orjson.loads(_dumps(value))
 
 
 def generate_field_diff(old_value: Any, new_value: Any) -> Dict[str, Any]:
     """
     Generate a diff for a single field
     """
-   
-    old_serialized = serialize_value(old_value)
-    new_serialized = serialize_value(new_value)
-    
-
     return {
-        "old": old_serialized,
-        "new": new_serialized
+        "old": serialize_value(old_value),
+        "new": serialize_value(new_value)
     }
 
 
@@ -53,14 +38,14 @@ def generate_object_diff(old_obj: Dict[str, Any], new_obj: Dict[str, Any]) -> Di
     diff = {}
     
   
-    all_keys = set(old_obj.keys()) | set(new_obj.keys())
+    all_keys = old_obj.keys() | new_obj.keys()
     
     for key in all_keys:
         old_value = old_obj.get(key)
         new_value = new_obj.get(key)
         
-       
-        if old_value == new_value:
+     
+        if old_value is new_value or old_value == new_value:
             continue
         
   
@@ -1,26 +1,55 @@
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
 from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import islice, takewhile
+
 import dateutil.rrule as rrule
+import orjson
+
+from app.schemas.event import RecurrencePattern
+
+
+FREQ_MAP = {
+    "daily": rrule.DAILY,
+    "weekly": rrule.WEEKLY,
+    "monthly": rrule.MONTHLY,
+    "yearly": rrule.YEARLY
+}
+
+WEEKDAY_MAP = [
+    rrule.MO, rrule.TU, rrule.WE, rrule.TH, rrule.FR, rrule.SA, rrule.SU
+]
+
+FIXED_STEP_DAYS = {
+    "daily": 1,
+    "weekly": 7
+}
 
+RRULE_CACHE_SIZE = 1024
 
-def parse_recurrence_pattern(pattern: Dict[str, Any]) -> rrule.rrule:
+DAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+MONTH_NAMES = (
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December"
+)
+
+ORDINALS = {1: "1st", 2: "2nd", 3: "3rd"}
+
+
+def _build_rrule(pattern_key: bytes, dtstart: Optional[datetime]) -> rrule.rrule:
     """
-    Parse a recurrence pattern dictionary into a dateutil.rrule
+    Build an rrule from the canonical JSON form of a pattern
     """
-    freq_map = {
-        "daily": rrule.DAILY,
-        "weekly": rrule.WEEKLY,
-        "monthly": rrule.MONTHLY,
-        "yearly": rrule.YEARLY
-    }
+    pattern = orjson.loads(pattern_key)
     
-
-    freq = freq_map.get(pattern.get("frequency", "daily").lower(), rrule.DAILY)
+    freq = FREQ_MAP.get(pattern.get("frequency", "daily").lower(), rrule.DAILY)
     
 
     kwargs = {
         "freq": freq,
+        "dtstart": dtstart,
         "interval": pattern.get("interval", 1)
     }
     
@@ -30,21 +59,11 @@ def parse_recurrence_pattern(pattern: Dict[str, Any]) -> rrule.rrule:
     
     
     if "until" in pattern and pattern["until"] is not None:
-        if isinstance(pattern["until"], str):
-           
-            kwargs["until"] = datetime.fromisoformat(pattern["until"])
-        else:
-            kwargs["until"] = pattern["until"]
+        kwargs["until"] = datetime.fromisoformat(pattern["until"])
     
    
     if "weekdays" in pattern and pattern["weekdays"]:
-        byweekday = []
-        weekday_map = [
-            rrule.MO, rrule.TU, rrule.WE, rrule.TH, rrule.FR, rrule.SA, rrule.SU
-        ]
-        for day in pattern["weekdays"]:
-            if 0 <= day <= 6:
-                byweekday.append(weekday_map[day])
+        byweekday = [WEEKDAY_MAP[day] for day in pattern["weekdays"] if 0 <= day <= 6]
         if byweekday:
             kwargs["byweekday"] = byweekday
     
@@ -59,6 +78,31 @@ def parse_recurrence_pattern(pattern: Dict[str, Any]) -> rrule.rrule:
     return rrule.rrule(**kwargs)
 
 
+_cached_rrule = lru_cache(maxsize=RRULE_CACHE_SIZE)(_build_rrule)
+
+
+def parse_recurrence_pattern(
+    pattern: Union[RecurrencePattern, Dict[str, Any]],
+    dtstart: Optional[datetime] = None
+) -> rrule.rrule:
+    """
+    Parse a recurrence pattern (schema or raw dictionary) into a dateutil.rrule
+
+    Rules are memoized on the JSON form of the pattern, so callers must
+    treat the returned rule as read-only. A validated RecurrencePattern is
+    dumped straight to JSON by pydantic-core without an intermediate dict.
+    Without a dtstart rrule anchors to the current time, so those rules are
+    built fresh on every call
+    """
+    if isinstance(pattern, RecurrencePattern):
+        pattern_key = pattern.model_dump_json(exclude_none=True).encode()
+    else:
+        pattern_key = orjson.dumps(pattern, option=orjson.OPT_SORT_KEYS)
+    if dtstart is None:
+        return _build_rrule(pattern_key, None)
+    return _cached_rrule(pattern_key, dtstart)
+
+
 def get_recurrence_occurrences(
     start_time: datetime,
     pattern: Dict[str, Any],
@@ -72,9 +116,6 @@ def get_recurrence_occurrences(
     if not pattern:
         return [start_time]
     
-   
-    rule = parse_recurrence_pattern(pattern)
-    
     
     if not start_range:
         start_range = start_time
@@ -82,10 +123,72 @@ def get_recurrence_occurrences(
         end_range = start_time + timedelta(days=365) 
    
 
-    occurrences = list(rule.between(start_range, end_range, inc=True))
+    step = _fixed_step(pattern)
+    if step is not None:
+        return _stride_occurrences(
+            start_time, pattern, step, start_range, end_range, max_occurrences
+        )
     
    
-    return occurrences[:max_occurrences]
+    rule = parse_recurrence_pattern(pattern, dtstart=start_time)
+    occurrences = takewhile(
+        lambda occurrence: occurrence <= end_range,
+        rule.xafter(start_range, inc=True)
+    )
+    
+   
+    return list(islice(occurrences, max_occurrences))
+
+
+def _fixed_step(pattern: Dict[str, Any]) -> Optional[timedelta]:
+    """
+    Return the stride for daily/weekly patterns without by-rules and with
+    a positive interval, else None
+    """
+    if pattern.get("weekdays") or pattern.get("monthdays") or pattern.get("months"):
+        return None
+    
+    days = FIXED_STEP_DAYS.get(pattern.get("frequency", "").lower())
+    interval = pattern.get("interval", 1)
+    # Non-positive intervals are left to rrule rather than divided by
+    if days is None or interval <= 0:
+        return None
+    return timedelta(days=days * interval)
+
+
+def _stride_occurrences(
+    start_time: datetime,
+    pattern: Dict[str, Any],
+    step: timedelta,
+    start_range: datetime,
+    end_range: datetime,
+    max_occurrences: int
+) -> List[datetime]:
+    """
+    Compute occurrences of a fixed-stride rule arithmetically, matching
+    what rrule would yield for the same pattern
+    """
+    # rrule drops sub-second precision from dtstart
+    start_time = start_time.replace(microsecond=0)
+    
+    first = 0
+    if start_range > start_time:
+        first = -((start_time - start_range) // step)
+    
+    last = (end_range - start_time) // step
+    
+    
+    if pattern.get("until") is not None:
+        until = pattern["until"]
+        if isinstance(until, str):
+            until = datetime.fromisoformat(until)
+        last = min(last, (until - start_time) // step)
+    
+    if pattern.get("count") is not None:
+        last = min(last, pattern["count"] - 1)
+    
+    last = min(last, first + max_occurrences - 1)
+    return [start_time + step * index for index in range(first, last + 1)]
 
 
 def format_recurrence_description(pattern: Dict[str, Any]) -> str:
@@ -106,8 +209,7 @@ def format_recurrence_description(pattern: Dict[str, Any]) -> str:
        
         weekdays = pattern.get("weekdays", [])
         if weekdays:
-            day_names = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-            days_str = ", ".join(day_names[day] for day in weekdays)
+            days_str = ", ".join(DAY_NAMES[day] for day in weekdays)
             base += f" on {days_str}"
     elif freq == "monthly":
         base = f"Every month" if interval == 1 else f"Every {interval} months"
@@ -120,14 +222,7 @@ def format_recurrence_description(pattern: Dict[str, Any]) -> str:
      
             if len(monthdays) == 1:
                 day = monthdays[0]
-                if day == 1:
-                    day_str = "1st"
-                elif day == 2:
-                    day_str = "2nd"
-                elif day == 3:
-                    day_str = "3rd"
-                else:
-                    day_str = f"{day}th"
+                day_str = ORDINALS.get(day, f"{day}th")
                 base += f" on the {day_str}"
             else:
                 base += f" on days {days_str}"
@@ -137,9 +232,7 @@ def format_recurrence_description(pattern: Dict[str, Any]) -> str:
       
         months = pattern.get("months", [])
         if months:
-            month_names = ["January", "February", "March", "April", "May", "June",
-                         "July", "August", "September", "October", "November", "December"]
-            months_str = ", ".join(month_names[month-1] for month in months)
+            months_str = ", ".join(MONTH_NAMES[month-1] for month in months)
             base += f" in {months_str}"
     else:
         return "Custom recurrence"